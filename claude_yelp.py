@@ -3,24 +3,148 @@
 Claude Yelp - A terminal-based session manager for Claude Code CLI
 """
 
+import bisect
+import functools
+import io
 import json
+import mmap
 import os
+import re
+import select
+import stat
 import subprocess
 import sys
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import groupby
 from pathlib import Path
-from typing import Dict, List, Optional
-
+from typing import (
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Set,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+from rich.markdown import Markdown
+from rich.text import Text
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Horizontal, ScrollableContainer, Vertical
 from textual.screen import ModalScreen
+from textual.timer import Timer
 from textual.widgets import Footer, Header, Input, ListItem, ListView, Static
+from textual.worker import get_current_worker
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+try:
+    import pyperclip
+except ImportError:
+    pyperclip = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    from Xlib import X
+    from Xlib.display import Display as XDisplay
+except ImportError:
+    XDisplay = None
 
 DEBUG_LOG_FILE = os.path.join(tempfile.gettempdir(), "claude-yelp-debug.log")
 DEBUG_ENABLED = False
 
+# str.translate table deleting control characters other than newlines and tabs
+_CONTROL_CHARS_TABLE = dict.fromkeys(i for i in range(32) if chr(i) not in "\n\r\t")
+
+# Markdown section headers for message roles in the thread view and exports
+_ROLE_HEADERS = {
+    "user": "## 👤 User\n\n",
+    "assistant": "## 🤖 Assistant\n\n",
+    "error": "## ❌ Error\n\n",
+}
+
+
+def _message_role(msg: Dict) -> str:
+    """Role of a parsed message, the key consecutive messages are grouped by"""
+    return msg.get("role", "unknown")
+
+
+def _pyperclip_copy(text: str):
+    """Copy text to the clipboard with pyperclip"""
+    if pyperclip is None:
+        raise RuntimeError("pyperclip not installed")
+    pyperclip.copy(text)
+
+
+_x_display = None
+
+
+def _read_x11_primary(timeout: float = 2.0) -> Optional[str]:
+    """Read the X11 PRIMARY selection in-process with python-xlib
+
+    Returns None when this isn't possible (no python-xlib, no X display, an
+    incremental transfer or no answer within timeout) so callers can fall back to
+    xclip, and "" when nothing is selected.
+    """
+    global _x_display
+    if XDisplay is None or not os.environ.get("DISPLAY"):
+        return None
+    try:
+        if _x_display is None:
+            _x_display = XDisplay()
+        display = _x_display
+        primary = display.intern_atom("PRIMARY")
+        target = display.intern_atom("UTF8_STRING")
+        prop = display.intern_atom("CLAUDE_YELP_SELECTION")
+        window = display.screen().root.create_window(0, 0, 1, 1, 0, X.CopyFromParent)
+        try:
+            window.convert_selection(primary, target, prop, X.CurrentTime)
+            display.flush()
+            deadline = time.monotonic() + timeout
+            while True:
+                while display.pending_events():
+                    event = display.next_event()
+                    if event.type != X.SelectionNotify or event.selection != primary:
+                        continue
+                    if event.property == X.NONE:
+                        # No owner, or it can't provide text
+                        return ""
+                    reply = window.get_full_property(prop, X.AnyPropertyType)
+                    if reply is None:
+                        return ""
+                    if reply.property_type == display.intern_atom("INCR"):
+                        return None
+                    value = reply.value
+                    if isinstance(value, bytes):
+                        return value.decode("utf-8", errors="replace")
+                    return ""
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                select.select([display], [], [], remaining)
+        finally:
+            window.destroy()
+            display.flush()
+    except Exception as e:
+        _debug_log(f"Xlib PRIMARY read failed: {e}")
+        _x_display = None
+        return None
+
 
 def _debug_log(msg: str):
     """Write debug message to file (only if DEBUG_ENABLED)"""
@@ -31,6 +155,142 @@ def _debug_log(msg: str):
         f.flush()
 
 
+@functools.lru_cache(maxsize=1024)
+def _list_dir(path: str) -> Optional[Set[str]]:
+    """Get the entry names of a directory (cached).
+
+    Returns an empty set for missing directories and None when the directory
+    exists but cannot be listed.
+    """
+    try:
+        with os.scandir(path) as it:
+            return {entry.name for entry in it}
+    except FileNotFoundError:
+        return set()
+    except OSError:
+        return None
+
+
+@functools.lru_cache(maxsize=4096)
+def _decode_project_path(encoded_name: str) -> str:
+    """Decode Claude's encoded project path back to actual filesystem path.
+
+    Claude encodes paths like /home/ilya.levin/dev/project as:
+    -home-ilya-levin-dev-project (dots and slashes become dashes)
+
+    We need to decode this back, handling dots in usernames and dashes in dir names.
+    """
+    # Remove leading dash and split by dash
+    if encoded_name.startswith("-"):
+        encoded_name = encoded_name[1:]
+
+    parts = encoded_name.split("-")
+
+    # Try to reconstruct the path by checking which combinations exist
+    # Start from root and build up, checking filesystem
+    current_path = "/"
+    i = 0
+
+    while i < len(parts):
+        part = parts[i]
+        entries = _list_dir(current_path)
+
+        def exists(name: str) -> bool:
+            if entries is None:
+                # Directory can't be listed (e.g. no read permission), probe directly
+                return os.path.exists(os.path.join(current_path, name))
+            return name in entries
+
+        # Try just this part
+        if exists(part):
+            current_path = os.path.join(current_path, part)
+            i += 1
+            continue
+
+        # Try combining with next parts using different separators
+        found = False
+        # Try progressively longer combinations with dots and dashes
+        for j in range(i + 1, min(i + 6, len(parts) + 1)):  # Try up to 5 parts combined
+            # Try with dots (for usernames like ilya.levin)
+            combined_dot = ".".join(parts[i:j])
+            if exists(combined_dot):
+                current_path = os.path.join(current_path, combined_dot)
+                i = j
+                found = True
+                break
+
+            # Try with dashes (for dir names like flex-host-agent)
+            combined_dash = "-".join(parts[i:j])
+            if exists(combined_dash):
+                current_path = os.path.join(current_path, combined_dash)
+                i = j
+                found = True
+                break
+
+        if not found:
+            # Just use the part as-is and continue (path may not exist)
+            current_path = os.path.join(current_path, part)
+            i += 1
+
+    return current_path
+
+
+def _read_session_head(file_path: str) -> Tuple[Optional[str], Optional[int]]:
+    """Get the first user message (truncated) and its timestamp from a session file.
+
+    The file is memory-mapped and its first line is parsed, which is usually the
+    first user message. Otherwise the rest is searched for lines mentioning "user",
+    so files that open with summary/snapshot lines only parse the candidates.
+    """
+    with open(file_path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return None, None
+
+    first_message = None
+    timestamp = None
+    with mm:
+        size = len(mm)
+        start = 0
+        while start < size:
+            if start:
+                # Past the first line only lines mentioning "user" can be a user message
+                hit = mm.find(b'"user"', start)
+                if hit < 0:
+                    break
+                line_start = mm.rfind(b"\n", start, hit)
+                if line_start >= 0:
+                    start = line_start + 1
+            end = mm.find(b"\n", start)
+            if end < 0:
+                end = size
+            line = mm[start:end]
+            start = end + 1
+            # Blank lines only; the decoder rejects whitespace-only ones anyway
+            if not line:
+                continue
+            try:
+                entry = json_loads(line)
+            except ValueError:
+                continue
+            if entry.get("type") == "user" and "message" in entry:
+                msg = entry["message"]
+                if isinstance(msg.get("content"), str):
+                    return msg["content"][:100], entry.get("timestamp")
+                elif isinstance(msg.get("content"), list):
+                    for item in msg["content"]:
+                        if item.get("type") == "text":
+                            first_message = item.get("text", "")[:100]
+                            timestamp = entry.get("timestamp")
+                            break
+                    if first_message:
+                        break
+
+    return first_message, timestamp
+
+
 class EscapableInput(Input):
     """Input that handles ESC to dismiss parent modal screen"""
 
@@ -63,8 +323,9 @@ class Session:
         self.timestamp = timestamp
         self.tag: Optional[str] = None
         self._messages: Optional[List[Dict]] = None
+        self._messages_mtime: Optional[int] = None  # File mtime_ns _messages was read at
 
-    @property
+    @functools.cached_property
     def display_name(self) -> str:
         """Get display name for the session"""
         if self.tag:
@@ -76,102 +337,230 @@ class Session:
         """Get project name from path"""
         return os.path.basename(self.project_path) if self.project_path else "unknown"
 
-    @property
+    @functools.cached_property
+    def _search_blob_lower(self) -> str:
+        """Lowercased id, tag, path and project name for metadata search"""
+        # NUL separated so a query can't match across two fields
+        fields = (self.session_id, self.tag or "", self.project_path, self.project_name)
+        return "\x00".join(fields).lower()
+
+    @functools.cached_property
     def date_str(self) -> str:
         """Get formatted date string"""
-        _debug_log(
-            f"date_str called for session {self.session_id[:8]}, "
-            f"timestamp={repr(self.timestamp)}, type={type(self.timestamp)}"
-        )
+        if DEBUG_ENABLED:
+            _debug_log(
+                f"date_str called for session {self.session_id[:8]}, "
+                f"timestamp={repr(self.timestamp)}, type={type(self.timestamp)}"
+            )
         if self.timestamp:
             try:
                 # Handle ISO format timestamp (e.g., "2025-11-25T12:36:37.257Z")
                 if isinstance(self.timestamp, str):
                     # Remove trailing Z and parse ISO format
                     ts_str = self.timestamp.rstrip("Z")
-                    _debug_log(f"  Parsing ISO string: {ts_str}")
-                    # Handle milliseconds in ISO format
-                    if "." in ts_str:
-                        dt = datetime.strptime(ts_str, "%Y-%m-%dT%H:%M:%S.%f")
-                    else:
-                        dt = datetime.strptime(ts_str, "%Y-%m-%dT%H:%M:%S")
-                    result = dt.strftime("%Y-%m-%d %H:%M")
-                    _debug_log(f"  Result: {result}")
+                    if DEBUG_ENABLED:
+                        _debug_log(f"  Parsing ISO string: {ts_str}")
+                    try:
+                        # Fixed "YYYY-MM-DDTHH:MM" prefix - slice it instead of strptime
+                        if ts_str[4:5] != "-" or ts_str[10:11] != "T":
+                            raise ValueError(f"unexpected timestamp layout: {ts_str}")
+                        result = (
+                            f"{int(ts_str[0:4]):04d}-{int(ts_str[5:7]):02d}-"
+                            f"{int(ts_str[8:10]):02d} "
+                            f"{int(ts_str[11:13]):02d}:{int(ts_str[14:16]):02d}"
+                        )
+                    except ValueError:
+                        # Handle milliseconds in ISO format
+                        if "." in ts_str:
+                            dt = datetime.strptime(ts_str, "%Y-%m-%dT%H:%M:%S.%f")
+                        else:
+                            dt = datetime.strptime(ts_str, "%Y-%m-%dT%H:%M:%S")
+                        result = dt.strftime("%Y-%m-%d %H:%M")
+                    if DEBUG_ENABLED:
+                        _debug_log(f"  Result: {result}")
                     return result
                 # Handle numeric timestamp (milliseconds)
                 elif isinstance(self.timestamp, (int, float)):
                     ts = int(self.timestamp)
-                    _debug_log(f"  Parsing numeric timestamp: {ts}")
+                    if DEBUG_ENABLED:
+                        _debug_log(f"  Parsing numeric timestamp: {ts}")
                     if ts > 0:
                         dt = datetime.fromtimestamp(ts / 1000)
                         result = dt.strftime("%Y-%m-%d %H:%M")
-                        _debug_log(f"  Result: {result}")
+                        if DEBUG_ENABLED:
+                            _debug_log(f"  Result: {result}")
                         return result
             except (ValueError, TypeError, OSError) as e:
-                _debug_log(f"  Error parsing timestamp: {e}")
+                if DEBUG_ENABLED:
+                    _debug_log(f"  Error parsing timestamp: {e}")
                 pass
-        _debug_log("  Returning 'unknown'")
+        if DEBUG_ENABLED:
+            _debug_log("  Returning 'unknown'")
         return "unknown"
 
-    def load_messages(self) -> List[Dict]:
-        """Load messages from the session file"""
-        if self._messages is not None:
-            return self._messages
-
-        messages = []
+    def _iter_messages(self) -> Iterator[Dict]:
+        """Parse messages from the session file one at a time"""
         try:
-            with open(self.file_path, "r", encoding="utf-8") as f:
+            with open(self.file_path, "rb") as f:
                 for line in f:
-                    line = line.strip()
-                    if not line:
+                    # Skip blank lines; the decoder tolerates the trailing newline
+                    if len(line) <= 1:
+                        continue
+                    # Cheap pre-filter: only user/assistant entries are kept, so skip
+                    # decoding lines that can't be one (the type is re-checked below)
+                    if b'"user"' not in line and b'"assistant"' not in line:
                         continue
                     try:
-                        entry = json.loads(line)
+                        entry = json_loads(line)
                         if entry.get("type") == "user" and "message" in entry:
                             msg = entry["message"]
                             if isinstance(msg.get("content"), str):
-                                messages.append(
-                                    {
-                                        "role": "user",
-                                        "content": msg["content"],
-                                        "timestamp": entry.get("timestamp"),
-                                    }
-                                )
+                                yield {
+                                    "role": "user",
+                                    "content": msg["content"],
+                                    "timestamp": entry.get("timestamp"),
+                                }
                             elif isinstance(msg.get("content"), list):
                                 for item in msg["content"]:
                                     if item.get("type") == "text":
-                                        messages.append(
-                                            {
-                                                "role": "user",
-                                                "content": item.get("text", ""),
-                                                "timestamp": entry.get("timestamp"),
-                                            }
-                                        )
+                                        yield {
+                                            "role": "user",
+                                            "content": item.get("text", ""),
+                                            "timestamp": entry.get("timestamp"),
+                                        }
                         elif entry.get("type") == "assistant" and "message" in entry:
                             msg = entry["message"]
                             if isinstance(msg.get("content"), list):
                                 for item in msg["content"]:
                                     if item.get("type") == "text":
-                                        messages.append(
-                                            {
-                                                "role": "assistant",
-                                                "content": item.get("text", ""),
-                                                "timestamp": entry.get("timestamp"),
-                                            }
-                                        )
+                                        yield {
+                                            "role": "assistant",
+                                            "content": item.get("text", ""),
+                                            "timestamp": entry.get("timestamp"),
+                                        }
                     except json.JSONDecodeError:
                         continue
         except Exception as e:
-            messages.append({"role": "error", "content": f"Error loading messages: {e}"})
+            yield {"role": "error", "content": f"Error loading messages: {e}"}
+
+    def _file_mtime(self) -> Optional[int]:
+        """Get the session file's mtime_ns, or None if it can't be read"""
+        try:
+            return os.stat(self.file_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def load_messages(self) -> List[Dict]:
+        """Load messages from the session file
+
+        The parsed messages are kept and reused until the file's mtime changes.
+        """
+        mtime = self._file_mtime()
+        if self._messages is not None and self._messages_mtime == mtime:
+            return self._messages
 
-        self._messages = messages
-        return messages
+        self._messages = list(self._iter_messages())
+        self._messages_mtime = mtime
+        return self._messages
+
+    def iter_grouped_messages(self, user_only: bool = False) -> Iterator[Tuple[str, str]]:
+        """Yield (role, text) for each run of consecutive messages with the same role
+
+        Uses the loaded messages if load_messages() was called since the file last
+        changed, otherwise streams them from the session file without caching.
+        """
+        messages: Iterator[Dict]
+        if self._messages is not None and self._messages_mtime == self._file_mtime():
+            messages = iter(self._messages)
+        else:
+            messages = self._iter_messages()
+        # Filter to user messages only if requested
+        if user_only:
+            messages = (msg for msg in messages if _message_role(msg) == "user")
+        for role, group in groupby(messages, key=_message_role):
+            yield role, "\n\n".join(msg.get("content", "") for msg in group)
+
+    def content_lower(self) -> str:
+        """Get the lowercased text of all messages, for content search"""
+        mtime = self._file_mtime()
+        if mtime is None:
+            return ""
+        return _session_content_lower(self, mtime)
+
+    def content_contains(self, query_lower: str) -> bool:
+        """Check whether the lowercased text of the messages contains query_lower"""
+        mtime = self._file_mtime()
+        if mtime is None:
+            return False
+        # The character set stays cached long after the text is evicted, so a query
+        # with a character this session never uses is rejected without re-reading it
+        if not _session_content_chars(self, mtime).issuperset(query_lower):
+            return False
+        return query_lower in _session_content_lower(self, mtime)
+
+
+@functools.lru_cache(maxsize=64)
+def _session_content_lower(session: Session, mtime: int) -> str:
+    """Join and lowercase a session's messages (cached per file modification time)"""
+    # NUL separated so a query can't match across two messages
+    return "\x00".join(msg.get("content", "") for msg in session._iter_messages()).lower()
+
+
+@functools.lru_cache(maxsize=1024)
+def _session_content_chars(session: Session, mtime: int) -> frozenset:
+    """Get the distinct characters of a session's lowercased text (cached per mtime)"""
+    return frozenset(_session_content_lower(session, mtime))
+
+
+T = TypeVar("T")
+
+
+class _SessionCache(Generic[T]):
+    """Bounded FIFO of values built from session files, keyed by (file_path, variant)
+
+    An entry is reused while the session file's mtime and the session's tag are
+    unchanged, and rebuilt otherwise.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        # (file_path, variant) -> (mtime_ns, tag, value), oldest first
+        self._entries: Dict[Tuple[str, bool], Tuple[Optional[int], Optional[str], T]] = {}
+
+    def get(self, session: Session, variant: bool, build: Callable[[], T]) -> T:
+        """Get the cached value for session, calling build() if it is missing or stale"""
+        key = (session.file_path, variant)
+        mtime = session._file_mtime()
+        cached = self._entries.get(key)
+        if cached is not None and cached[0] == mtime and cached[1] == session.tag:
+            return cached[2]
+
+        value = build()
+
+        # Bounded FIFO: drop the oldest entry once the cache is full
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.maxsize:
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = (mtime, session.tag, value)
+        return value
 
 
 class SessionManager:
-    """Manages Claude sessions"""
+    """Manages Claude sessions
+
+    With discover=False the scan is left to the caller, who can run
+    _discover_sessions_async() on a worker thread and receive sessions in batches.
+    """
+
+    # Number of sessions handed to on_batch at a time during discovery
+    DISCOVERY_BATCH_SIZE = 32
+    # Number of rendered copy/export markdown documents kept in memory
+    MARKDOWN_CACHE_SIZE = 32
+    # Format of claude-yelp-index.json; bumped when cached entries must be re-read
+    # (version 2: first messages past a session's first 16 lines are no longer missed)
+    INDEX_VERSION = 2
 
-    def __init__(self, claude_dir: Path = None):
+    def __init__(self, claude_dir: Path = None, discover: bool = True):
         _debug_log("SessionManager.__init__ starting")
         if claude_dir is None:
             claude_dir = Path.home() / ".claude"
@@ -179,19 +568,29 @@ class SessionManager:
         self.projects_dir = claude_dir / "projects"
         self.history_file = claude_dir / "history.jsonl"
         self.tags_file = claude_dir / "claude-yelp-tags.json"
+        self.index_file = claude_dir / "claude-yelp-index.json"
         self.sessions: List[Session] = []
+        self._sessions_by_id: Dict[str, Session] = {}
         self.tags: Dict[str, str] = {}
+        # file_path -> [mtime_ns, size, first_message, timestamp]
+        self._index: Dict[str, list] = {}
+        self._index_dirty = False
+        # Copy/export markdown per (file_path, export)
+        self._markdown_cache: _SessionCache[str] = _SessionCache(self.MARKDOWN_CACHE_SIZE)
+        self.discovered = False
         self._load_tags()
-        _debug_log("Calling _discover_sessions")
-        self._discover_sessions()
+        self._load_index()
+        if discover:
+            _debug_log("Calling _discover_sessions")
+            self._discover_sessions()
         _debug_log(f"SessionManager.__init__ done, found {len(self.sessions)} sessions")
 
     def _load_tags(self):
         """Load session tags from file"""
         if self.tags_file.exists():
             try:
-                with open(self.tags_file, "r") as f:
-                    self.tags = json.load(f)
+                with open(self.tags_file, "rb") as f:
+                    self.tags = json_loads(f.read())
             except Exception:
                 self.tags = {}
 
@@ -203,66 +602,46 @@ class SessionManager:
         except Exception as e:
             _debug_log(f"Failed to save tags: {e}")
 
-    def _decode_project_path(self, encoded_name: str) -> str:
-        """Decode Claude's encoded project path back to actual filesystem path.
+    def _load_index(self):
+        """Load cached session metadata from file
 
-        Claude encodes paths like /home/ilya.levin/dev/project as:
-        -home-ilya-levin-dev-project (dots and slashes become dashes)
-
-        We need to decode this back, handling dots in usernames and dashes in dir names.
+        An index written by an older version is discarded, so its sessions are
+        read again.
         """
-        # Remove leading dash and split by dash
-        if encoded_name.startswith("-"):
-            encoded_name = encoded_name[1:]
-
-        parts = encoded_name.split("-")
-
-        # Try to reconstruct the path by checking which combinations exist
-        # Start from root and build up, checking filesystem
-        current_path = "/"
-        i = 0
-
-        while i < len(parts):
-            part = parts[i]
-
-            # Try just this part
-            test_path = os.path.join(current_path, part)
-            if os.path.exists(test_path):
-                current_path = test_path
-                i += 1
-                continue
-
-            # Try combining with next parts using different separators
-            found = False
-            # Try progressively longer combinations with dots and dashes
-            for j in range(i + 1, min(i + 6, len(parts) + 1)):  # Try up to 5 parts combined
-                # Try with dots (for usernames like ilya.levin)
-                combined_dot = ".".join(parts[i:j])
-                test_path = os.path.join(current_path, combined_dot)
-                if os.path.exists(test_path):
-                    current_path = test_path
-                    i = j
-                    found = True
-                    break
-
-                # Try with dashes (for dir names like flex-host-agent)
-                combined_dash = "-".join(parts[i:j])
-                test_path = os.path.join(current_path, combined_dash)
-                if os.path.exists(test_path):
-                    current_path = test_path
-                    i = j
-                    found = True
-                    break
-
-            if not found:
-                # Just use the part as-is and continue (path may not exist)
-                current_path = os.path.join(current_path, part)
-                i += 1
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, "rb") as f:
+                    data = json_loads(f.read())
+                if data.get("version") == self.INDEX_VERSION:
+                    self._index = data["sessions"]
+                else:
+                    self._index = {}
+            except Exception:
+                self._index = {}
 
-        return current_path
+    def _save_index(self):
+        """Save cached session metadata to file"""
+        try:
+            with open(self.index_file, "w") as f:
+                json.dump({"version": self.INDEX_VERSION, "sessions": self._index}, f)
+        except Exception as e:
+            _debug_log(f"Failed to save index: {e}")
 
     def _discover_sessions(self):
         """Discover all Claude sessions"""
+        self._discover_sessions_async()
+
+    def _discover_sessions_async(
+        self,
+        on_batch: Optional[Callable[[List[Session]], None]] = None,
+        on_done: Optional[Callable[[], None]] = None,
+    ):
+        """Discover all Claude sessions, reporting progress through callbacks
+
+        on_batch receives sessions in discovery order (unsorted) as they are read,
+        on_done is called once self.sessions holds the complete sorted list. Both are
+        called from the thread running the discovery.
+        """
         _debug_log("_discover_sessions started")
         sessions = []
 
@@ -270,13 +649,13 @@ class SessionManager:
         history_sessions = {}
         if self.history_file.exists():
             try:
-                with open(self.history_file, "r", encoding="utf-8") as f:
+                with open(self.history_file, "rb") as f:
                     for line in f:
-                        line = line.strip()
-                        if not line:
+                        # Skip blank lines; the decoder tolerates the trailing newline
+                        if len(line) <= 1:
                             continue
                         try:
-                            entry = json.loads(line)
+                            entry = json_loads(line)
                             display = entry.get("display", "")
                             project = entry.get("project", "")
                             timestamp = entry.get("timestamp", 0)
@@ -290,108 +669,163 @@ class SessionManager:
                 _debug_log(f"Failed to parse history file: {e}")
 
         # Scan projects directory for session files
-        _debug_log(f"Scanning projects dir: {self.projects_dir}")
+        if DEBUG_ENABLED:
+            _debug_log(f"Scanning projects dir: {self.projects_dir}")
+        tasks = []
         if self.projects_dir.exists():
-            for project_dir in self.projects_dir.iterdir():
-                if not project_dir.is_dir():
-                    continue
-
-                # Decode project path
-                # e.g., -home-ilya-levin-dev-devops -> /home/ilya.levin/dev/devops
-                project_path = self._decode_project_path(project_dir.name)
-                _debug_log(f"  Project: {project_dir.name} -> {project_path}")
-
-                for session_file in project_dir.glob("*.jsonl"):
-                    session_id = session_file.stem
-
-                    # Skip agent files
-                    if session_id.startswith("agent-"):
+            # scandir entries carry the file type from the directory read, so
+            # filtering them costs no extra stat calls
+            with os.scandir(self.projects_dir) as projects:
+                for project_dir in projects:
+                    if not project_dir.is_dir():
                         continue
 
-                    # Get first message and timestamp
-                    first_message = None
-                    timestamp = None
+                    # Decode project path
+                    # e.g., -home-ilya-levin-dev-devops -> /home/ilya.levin/dev/devops
+                    project_path = _decode_project_path(project_dir.name)
+                    if DEBUG_ENABLED:
+                        _debug_log(f"  Project: {project_dir.name} -> {project_path}")
 
                     try:
-                        with open(session_file, "r", encoding="utf-8") as f:
-                            for line in f:
-                                line = line.strip()
-                                if not line:
+                        with os.scandir(project_dir.path) as entries:
+                            for session_file in entries:
+                                if not session_file.name.endswith(".jsonl"):
                                     continue
-                                try:
-                                    entry = json.loads(line)
-                                    if entry.get("type") == "user" and "message" in entry:
-                                        msg = entry["message"]
-                                        if isinstance(msg.get("content"), str):
-                                            first_message = msg["content"][:100]
-                                            timestamp = entry.get("timestamp")
-                                            break
-                                        elif isinstance(msg.get("content"), list):
-                                            for item in msg["content"]:
-                                                if item.get("type") == "text":
-                                                    first_message = item.get("text", "")[:100]
-                                                    timestamp = entry.get("timestamp")
-                                                    break
-                                            if first_message:
-                                                break
-                                except json.JSONDecodeError:
+                                # Skip agent files
+                                if session_file.name.startswith("agent-"):
                                     continue
-                    except Exception as e:
-                        _debug_log(f"Failed to read session file {session_file}: {e}")
-
-                    _debug_log(f"Creating session {session_id[:8]}: timestamp={repr(timestamp)}")
-                    session = Session(
-                        session_id=session_id,
-                        project_path=project_path,
-                        file_path=str(session_file),
-                        first_message=first_message,
-                        timestamp=timestamp,
-                    )
-
-                    # Apply tag if exists
-                    if session_id in self.tags:
-                        session.tag = self.tags[session_id]
+                                tasks.append((project_path, session_file))
+                    except OSError as e:
+                        # Unreadable, or removed since the projects dir was listed
+                        _debug_log(f"Failed to scan project dir {project_dir.name}: {e}")
+                        continue
 
+        # Reading session heads is I/O-bound, so overlap the reads across threads
+        if tasks:
+            max_workers = min(32, (os.cpu_count() or 1) * 4)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                batch = []
+                for session in executor.map(self._extract_session_head, tasks):
                     sessions.append(session)
+                    if on_batch is not None:
+                        batch.append(session)
+                        if len(batch) >= self.DISCOVERY_BATCH_SIZE:
+                            on_batch(batch)
+                            batch = []
+                if batch:
+                    on_batch(batch)
+
+        # Drop index entries for session files that no longer exist
+        live_paths = {s.file_path for s in sessions}
+        if any(path not in live_paths for path in self._index):
+            self._index = {p: e for p, e in self._index.items() if p in live_paths}
+            self._index_dirty = True
+        if self._index_dirty:
+            self._save_index()
+            self._index_dirty = False
 
         # Sort by timestamp (most recent first)
-        # Handle both ISO format strings and numeric timestamps
+        # Handle both ISO format strings and numeric timestamps by mapping them
+        # onto comparable (has_timestamp, (Y, M, D, h, m, s, ms)) tuples
         def get_timestamp(s):
             ts = s.timestamp
             if ts is None:
-                return ""
-            if isinstance(ts, str):
-                # ISO format strings sort lexicographically correctly
-                return ts
-            # Numeric timestamp - convert to ISO-like string for consistent sorting
+                return (0, ())
             try:
-                dt = datetime.fromtimestamp(int(ts) / 1000)
-                return dt.isoformat()
-            except (ValueError, TypeError, OSError):
-                return ""
+                if isinstance(ts, str):
+                    # Fixed "YYYY-MM-DDTHH:MM:SS[.fff]" layout - slice the fields
+                    if ts[4:5] != "-" or ts[10:11] != "T":
+                        return (1, ())
+                    ms = int(ts[20:23]) if ts[19:20] == "." and ts[20:23].isdigit() else 0
+                    return (
+                        1,
+                        (
+                            int(ts[0:4]),
+                            int(ts[5:7]),
+                            int(ts[8:10]),
+                            int(ts[11:13]),
+                            int(ts[14:16]),
+                            int(ts[17:19]),
+                            ms,
+                        ),
+                    )
+                # Numeric timestamp (milliseconds) - local time, like date_str
+                ts = int(ts)
+                return (1, tuple(time.localtime(ts // 1000)[:6]) + (ts % 1000,))
+            except (ValueError, TypeError, OSError, OverflowError):
+                return (0, ())
 
         sessions.sort(key=get_timestamp, reverse=True)
         self.sessions = sessions
 
+        # Index by ID for O(1) lookups; the first (most recent) session wins
+        # on duplicate IDs, as the linear scans used to
+        sessions_by_id: Dict[str, Session] = {}
+        for session in sessions:
+            sessions_by_id.setdefault(session.session_id, session)
+        self._sessions_by_id = sessions_by_id
+
+        self.discovered = True
+        if on_done is not None:
+            on_done()
+
+    def _extract_session_head(self, task: Tuple[str, os.DirEntry]) -> Session:
+        """Build a Session from a (project_path, session_file) discovery task"""
+        project_path, session_file = task
+        session_id = session_file.name[: -len(".jsonl")]
+
+        file_path = session_file.path
+
+        # Get first message and timestamp
+        first_message = None
+        timestamp = None
+
+        try:
+            st = session_file.stat()
+            cached = self._index.get(file_path)
+            if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                # Unchanged since last scan - reuse cached metadata
+                first_message, timestamp = cached[2], cached[3]
+            else:
+                first_message, timestamp = _read_session_head(file_path)
+                self._index[file_path] = [st.st_mtime_ns, st.st_size, first_message, timestamp]
+                self._index_dirty = True
+        except Exception as e:
+            _debug_log(f"Failed to read session file {file_path}: {e}")
+
+        if DEBUG_ENABLED:
+            _debug_log(f"Creating session {session_id[:8]}: timestamp={repr(timestamp)}")
+        session = Session(
+            session_id=session_id,
+            project_path=project_path,
+            file_path=file_path,
+            first_message=first_message,
+            timestamp=timestamp,
+        )
+
+        # Apply tag if exists
+        if session_id in self.tags:
+            session.tag = self.tags[session_id]
+
+        return session
+
     def tag_session(self, session_id: str, tag: str):
         """Tag a session"""
         self.tags[session_id] = tag
         self._save_tags()
 
         # Update session object
-        for session in self.sessions:
-            if session.session_id == session_id:
-                session.tag = tag
-                break
+        session = self._sessions_by_id.get(session_id)
+        if session:
+            session.tag = tag
+            # Drop the memoized display name and search text so they pick up the new tag
+            session.__dict__.pop("display_name", None)
+            session.__dict__.pop("_search_blob_lower", None)
 
     def start_session(self, session_id: str) -> bool:
         """Start a Claude session with the given session ID"""
         # Find the session
-        session = None
-        for s in self.sessions:
-            if s.session_id == session_id:
-                session = s
-                break
+        session = self._sessions_by_id.get(session_id)
 
         if not session:
             return False
@@ -415,11 +849,7 @@ class SessionManager:
     def delete_session(self, session_id: str) -> bool:
         """Delete a session file"""
         # Find the session
-        session = None
-        for s in self.sessions:
-            if s.session_id == session_id:
-                session = s
-                break
+        session = self._sessions_by_id.get(session_id)
 
         if not session:
             return False
@@ -431,6 +861,7 @@ class SessionManager:
 
                 # Remove from sessions list
                 self.sessions = [s for s in self.sessions if s.session_id != session_id]
+                del self._sessions_by_id[session_id]
 
                 # Remove tag if exists
                 if session_id in self.tags:
@@ -443,15 +874,70 @@ class SessionManager:
             print(f"Error deleting session: {e}", file=sys.stderr)
             return False
 
+    def build_session_markdown(self, session: Session, export: bool = False) -> str:
+        """Build the markdown for a session thread as copied (c) or exported (e)
+
+        Results are memoized and rebuilt when the session file's mtime or the
+        session's tag changes.
+        """
+        return self._markdown_cache.get(
+            session, export, functools.partial(self._render_session_markdown, session, export)
+        )
+
+    def _render_session_markdown(self, session: Session, export: bool) -> str:
+        """Render the copy/export markdown for a session thread"""
+        messages = session.load_messages()
+        out = io.StringIO()
+        write = out.write
+
+        title = "Claude Session" if export else "Session"
+        tag_line = f"**Tag:** {session.tag}\n\n" if session.tag else ""
+        write(
+            f"# {title}: {session.session_id}\n\n"
+            f"**Project:** `{session.project_path}`\n\n"
+            f"**Date:** {session.date_str}\n\n"
+            f"{tag_line}---\n\n"
+        )
+
+        if export:
+            for msg in messages:
+                # For export, keep plain text (no Rich markup)
+                header = _ROLE_HEADERS.get(msg.get("role", "unknown"))
+                if header:
+                    write(header)
+                    write(msg.get("content", ""))
+                    write("\n\n")
+
+            if not messages:
+                write("*No messages found in this session.*\n")
+        elif not messages:
+            write("*No messages found in this session.*\n")
+        else:
+            for role, combined_text in session.iter_grouped_messages():
+                write(f"## {role.title()}\n\n")
+                write(combined_text)
+                write("\n\n")
+
+        return out.getvalue()
+
 
 class SessionList(ListView):
-    """Custom list view for sessions"""
+    """Custom list view for sessions
+
+    Rows are mounted lazily: only up to RENDER_AHEAD rows past the selection are
+    created up front, the rest are mounted as the selection or scroll position
+    approaches them.
+    """
+
+    RENDER_AHEAD = 100
 
     def __init__(self, session_manager: SessionManager, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.session_manager = session_manager
         self.selected_index = 0
         self._sessions_to_display: List[Session] = []
+        self._rendered_count = 0
+        self._populate_generation = 0
 
     def on_mount(self):
         """Called when widget is mounted"""
@@ -466,72 +952,122 @@ class SessionList(ListView):
         """Populate the list with sessions"""
         old_index = self.index if hasattr(self, "index") and preserve_index else None
         self.clear()
+        self._populate_generation += 1
+        generation = self._populate_generation
 
         # Use provided sessions or default to all sessions
         if sessions is None:
             sessions = self.session_manager.sessions
 
         self._sessions_to_display = sessions
+        self._rendered_count = 0
 
-        # Always use max 4 digits for alignment
-        width = 4
+        if not sessions:
+            return
 
-        for i, session in enumerate(sessions, start=1):
-            # Format number with right alignment and space padding (max 4 digits)
-            number_str = str(i).rjust(width, " ")
-            display = (
-                f"{number_str} {session.date_str} | {session.display_name} | {session.project_name}"
-            )
-            list_item = ListItem(Static(display))
-            self.append(list_item)
+        if initial_index is not None and 0 <= initial_index < len(sessions):
+            target_idx = initial_index
+        elif preserve_index and old_index is not None and old_index < len(sessions):
+            target_idx = old_index
+        else:
+            target_idx = 0
 
-        # Set index after all items are added
-        # Use call_after_refresh to ensure items are mounted before setting index and highlighting
-        def set_index_and_highlight():
-            if sessions:
-                target_idx = None
-                if initial_index is not None and 0 <= initial_index < len(sessions):
-                    target_idx = initial_index
-                elif preserve_index and old_index is not None and old_index < len(sessions):
-                    target_idx = old_index
-                else:
-                    target_idx = 0
+        self._render_rows(target_idx + self.RENDER_AHEAD)
 
-                if target_idx is not None:
-                    self.index = target_idx
-                    # Manually ensure the highlight is set
-                    try:
-                        if hasattr(self, "_nodes") and target_idx < len(self._nodes):
-                            highlighted_item = self._nodes[target_idx]
-                            if isinstance(highlighted_item, ListItem):
-                                highlighted_item.highlighted = True
-                    except (IndexError, AttributeError, TypeError):
-                        pass
-
-        # Set index immediately
-        if sessions:
-            if initial_index is not None and 0 <= initial_index < len(sessions):
-                self.index = initial_index
-            elif preserve_index and old_index is not None and old_index < len(sessions):
-                self.index = old_index
-            else:
-                self.index = 0
+        # Set index immediately so callers see the new selection
+        self.index = target_idx
+
+        # The cleared items are removed asynchronously, so the highlight set above may
+        # land on an outgoing item - re-apply it once only the new items are left
+        def set_index_and_highlight():
+            if generation != self._populate_generation:
+                # A newer _populate call took over
+                return
+            if len(self._nodes) > self._rendered_count:
+                # Old items not pruned yet, try again after the next refresh
+                self.call_after_refresh(set_index_and_highlight)
+                return
+            self.index = target_idx
+            # Setting the index before the prune may have highlighted a new item at
+            # the wrong position, so reset the highlight on all of them
+            for i, item in enumerate(self._nodes):
+                if isinstance(item, ListItem):
+                    item.highlighted = i == target_idx
+            # The index didn't change, so ListView won't scroll to it by itself
+            self._nodes[target_idx].scroll_visible(animate=False)
 
-        # Also set it after refresh to ensure highlighting is applied
         self.call_after_refresh(set_index_and_highlight)
 
+    def _render_rows(self, upto: int):
+        """Mount rows for sessions up to (not including) index upto"""
+        upto = min(upto, len(self._sessions_to_display))
+        if upto <= self._rendered_count:
+            return
+
+        # Always use max 4 digits for alignment
+        width = 4
+
+        # Build the rows first and mount them in one batch
+        start = self._rendered_count
+        items = [
+            ListItem(
+                Static(
+                    f"{str(i).rjust(width, ' ')} {session.date_str} | "
+                    f"{session.display_name} | {session.project_name}"
+                )
+            )
+            for i, session in enumerate(self._sessions_to_display[start:upto], start=start + 1)
+        ]
+        self._rendered_count = upto
+        self.extend(items)
+
+    def _append_batch(self, sessions: List[Session]):
+        """Append sessions delivered by a discovery that is still running"""
+        if (
+            not self._sessions_to_display
+            or self._sessions_to_display is self.session_manager.sessions
+        ):
+            # Start a list of our own rather than extending the manager's
+            self._sessions_to_display = list(self._sessions_to_display)
+        self._sessions_to_display.extend(sessions)
+        self._show_appended()
+
+    def _show_appended(self):
+        """Mount rows for sessions added to the end of the displayed list"""
+        self._render_rows((self.index or 0) + self.RENDER_AHEAD)
+        if self.index is None:
+            self.index = 0
+
+    def validate_index(self, index: Optional[int]) -> Optional[int]:
+        """Mount rows ahead of the new index before it gets clamped"""
+        if index is not None:
+            self._render_rows(index + self.RENDER_AHEAD)
+        return super().validate_index(index)
+
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        """Mount more rows when scrolling close to the last mounted one"""
+        super().watch_scroll_y(old_value, new_value)
+        if new_value >= self.max_scroll_y - self.size.height:
+            self._render_rows(self._rendered_count + self.RENDER_AHEAD)
+
     def get_sessions(self) -> List[Session]:
         """Get the list of sessions currently displayed"""
         return self._sessions_to_display
 
+    @property
+    def current_sessions(self) -> List[Session]:
+        """Sessions navigation works on: the displayed list, or all sessions if empty"""
+        return self._sessions_to_display or self.session_manager.sessions
+
+    @property
+    def max_index(self) -> int:
+        """Index of the last navigable session, -1 if there are none"""
+        return len(self.current_sessions) - 1
+
     def get_selected_session(self) -> Optional[Session]:
         """Get the currently selected session"""
         idx = self.index if hasattr(self, "index") and self.index is not None else 0
-        sessions = (
-            self._sessions_to_display
-            if self._sessions_to_display
-            else self.session_manager.sessions
-        )
+        sessions = self.current_sessions
         if 0 <= idx < len(sessions):
             return sessions[idx]
         return None
@@ -545,10 +1081,19 @@ class ThreadContent(Static):
 
 
 class ThreadView(ScrollableContainer):
-    """View for displaying conversation thread - allows text selection"""
+    """View for displaying conversation thread - allows text selection
+
+    Long threads are rendered in chunks of roughly CHUNK_CHARS characters: the
+    first chunk goes into #thread-content and the rest are mounted below it as
+    the view is scrolled towards the end.
+    """
 
     ALLOW_SELECT = True
 
+    CHUNK_CHARS = 20000
+    # Number of rendered (session, user_only) threads kept for re-display
+    CONTENT_CACHE_SIZE = 16
+
     BINDINGS = [
         Binding("up", "scroll_up", "Scroll Up", priority=True),
         Binding("down", "scroll_down", "Scroll Down", priority=True),
@@ -561,6 +1106,9 @@ class ThreadView(ScrollableContainer):
         self.session_manager = session_manager
         self.current_session: Optional[Session] = None
         self._pending_update: Optional[Session] = None
+        self._pending_chunks: List[str] = []
+        # Markdown blocks per (file_path, user_only)
+        self._content_cache: _SessionCache[List[str]] = _SessionCache(self.CONTENT_CACHE_SIZE)
 
     def action_scroll_up(self):
         """Scroll up in thread view"""
@@ -597,30 +1145,68 @@ class ThreadView(ScrollableContainer):
             # Widget not mounted yet, store for later
             self._pending_update = session
 
-    def _highlight_text(self, text: str, term: str) -> str:
-        """Highlight search term in text using Rich markup"""
+    def _split_chunk(self, blocks: List[str]) -> Tuple[List[str], List[str]]:
+        """Split off the leading blocks that make up the next chunk"""
+        size = 0
+        for i, block in enumerate(blocks):
+            size += len(block)
+            if size >= self.CHUNK_CHARS:
+                return blocks[: i + 1], blocks[i + 1 :]
+        return blocks, []
+
+    def _clear_chunks(self):
+        """Remove lazily mounted chunks and drop any not yet rendered"""
+        self._pending_chunks = []
+        self.query(".thread-chunk").remove()
+
+    def _render_next_chunk(self) -> bool:
+        """Mount the next pending chunk, returns False if there was none"""
+        if not self._pending_chunks:
+            return False
+
+        chunk, self._pending_chunks = self._split_chunk(self._pending_chunks)
+        self.mount(ThreadContent(Markdown("".join(chunk)), classes="thread-chunk"))
+        return True
+
+    def render_all(self) -> bool:
+        """Mount all pending chunks at once, returns False if there were none"""
+        if not self._pending_chunks:
+            return False
+
+        rest, self._pending_chunks = self._pending_chunks, []
+        self.mount(ThreadContent(Markdown("".join(rest)), classes="thread-chunk"))
+        return True
+
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        """Mount the next chunk when scrolling close to the end of what's rendered"""
+        super().watch_scroll_y(old_value, new_value)
+        if self._pending_chunks and new_value >= self.max_scroll_y - self.size.height:
+            self._render_next_chunk()
+
+    def _highlight_text(self, text: str, term: str, pattern: Optional[Pattern[str]]) -> str:
+        """Highlight search term in text using Rich markup
+
+        pattern is the compiled case-insensitive pattern for term, or None when term
+        has no cased characters and can be replaced literally.
+        """
         if not term:
             return text
 
-        import re
+        # Using [reverse] for highlighting as it works well in terminals
+        if pattern is None:
+            return text.replace(term, f"[reverse yellow]{term}[/reverse yellow]")
 
         # Case-insensitive replacement with highlight markup
-        # Using [reverse] for highlighting as it works well in terminals
-        pattern = re.compile(re.escape(term), re.IGNORECASE)
         return pattern.sub(lambda m: f"[reverse yellow]{m.group(0)}[/reverse yellow]", text)
 
-    def _do_update_session(
+    def _build_content(
         self, session: Session, user_only: bool = False, highlight_term: str = ""
-    ):
-        """Internal method to update the session view"""
-        messages = session.load_messages()
-
-        # Filter to user messages only if requested
-        if user_only:
-            messages = [msg for msg in messages if msg.get("role") == "user"]
-
-        from rich.markdown import Markdown
-        from rich.text import Text
+    ) -> List[str]:
+        """Build the thread as a list of markdown (or Rich markup) blocks"""
+        # Compile the highlight pattern once for all message groups
+        highlight_pattern = None
+        if highlight_term and highlight_term.lower() != highlight_term.upper():
+            highlight_pattern = re.compile(re.escape(highlight_term), re.IGNORECASE)
 
         content = []
         content.append(f"# Session: {session.session_id}\n\n")
@@ -634,49 +1220,52 @@ class ThreadView(ScrollableContainer):
             content.append(f"**Search:** `{highlight_term}`\n\n")
         content.append("---\n\n")
 
-        # Group consecutive messages with the same role
-        if not messages:
+        # Consecutive messages with the same role come grouped
+        has_messages = False
+        for role, combined_text in session.iter_grouped_messages(user_only):
+            has_messages = True
+
+            # Highlight search term if provided
+            if highlight_term:
+                combined_text = self._highlight_text(
+                    combined_text, highlight_term, highlight_pattern
+                )
+
+            # Format based on role
+            header = _ROLE_HEADERS.get(role) or f"## {role.title()}\n\n"
+            content.append(header + combined_text + "\n\n")
+
+        if not has_messages:
             content.append("*No messages found in this session.*\n")
-        else:
-            i = 0
-            while i < len(messages):
-                current_role = messages[i].get("role", "unknown")
-                combined_texts = [messages[i].get("content", "")]
-
-                # Collect consecutive messages with the same role
-                j = i + 1
-                while j < len(messages) and messages[j].get("role") == current_role:
-                    combined_texts.append(messages[j].get("content", ""))
-                    j += 1
-
-                # Combine the texts
-                combined_text = "\n\n".join(combined_texts)
-
-                # Highlight search term if provided
-                if highlight_term:
-                    combined_text = self._highlight_text(combined_text, highlight_term)
-
-                # Format based on role
-                if current_role == "user":
-                    content.append(f"## 👤 User\n\n{combined_text}\n\n")
-                elif current_role == "assistant":
-                    content.append(f"## 🤖 Assistant\n\n{combined_text}\n\n")
-                elif current_role == "error":
-                    content.append(f"## ❌ Error\n\n{combined_text}\n\n")
-                else:
-                    content.append(f"## {current_role.title()}\n\n{combined_text}\n\n")
 
-                i = j
+        return content
+
+    def _get_cached_content(self, session: Session, user_only: bool) -> List[str]:
+        """Get the markdown blocks for a session, rebuilding only when it changed
 
+        Entries are reused while the session file's mtime and the session's tag are
+        unchanged, so toggling user-only mode or revisiting a session skips parsing.
+        """
+        return self._content_cache.get(
+            session, user_only, functools.partial(self._build_content, session, user_only)
+        )
+
+    def _do_update_session(
+        self, session: Session, user_only: bool = False, highlight_term: str = ""
+    ):
+        """Internal method to update the session view"""
+        self._clear_chunks()
         content_widget = self.query_one("#thread-content", ThreadContent)
 
         if highlight_term:
             # Use Rich Text with markup for highlighting (can't use Markdown with highlights)
+            content = self._build_content(session, user_only, highlight_term)
             content_widget.update(Text.from_markup("".join(content)))
         else:
-            # Use Markdown for normal rendering
-            markdown = Markdown("".join(content))
-            content_widget.update(markdown)
+            # Use Markdown for normal rendering, deferring all but the first chunk
+            content = self._get_cached_content(session, user_only)
+            first, self._pending_chunks = self._split_chunk(content)
+            content_widget.update(Markdown("".join(first)))
 
 
 class HelpScreen(ModalScreen):
@@ -763,59 +1352,16 @@ class ClaudeYelpApp(App):
 
     ALLOW_SELECT = True
 
-    CSS = """
-    Screen {
-        layout: vertical;
-    }
-
-    Horizontal {
-        height: 1fr;
-    }
-
-    #session-list {
-        width: 30%;
-        border-right: solid $primary;
-    }
-
-    #thread-view {
-        width: 70%;
-    }
-
-    #session-list:focus > ListItem.-highlight {
-        background: $accent;
-        text-style: bold;
-    }
-
-    #session-list > ListItem.-highlight {
-        background: $accent;
-        text-style: bold;
-    }
-
-    HelpScreen {
-        align: center middle;
-    }
-
-    #help-container {
-        width: 70;
-        max-height: 90%;
-        background: $surface;
-        border: thick $primary;
-        padding: 1 2;
-        overflow-y: auto;
-    }
-
-    #help-title {
-        text-align: center;
-        text-style: bold;
-        margin-bottom: 1;
-    }
-
-    #help-footer {
-        text-align: center;
-        margin-top: 1;
-        color: $text-muted;
-    }
-    """
+    # Seconds the session list selection must rest before the thread view follows
+    THREAD_UPDATE_DELAY = 0.05
+    # Seconds pane resizes are collected for before being applied (about one frame)
+    PANE_RESIZE_DELAY = 1 / 60
+    # Sessions content-searched between updates of the filtered list
+    SEARCH_BATCH_SIZE = 32
+    # Newest sessions whose message text is cached in the background after startup
+    SEARCH_WARMUP_SESSIONS = 16
+
+    CSS_PATH = "claude_yelp.tcss"
 
     BINDINGS = [
         # Shown in footer bar
@@ -849,29 +1395,57 @@ class ClaudeYelpApp(App):
 
     def check_action(self, action: str, parameters) -> bool | None:
         """Disable app actions when a modal (like HelpScreen) is active."""
-        if any(isinstance(s, HelpScreen) for s in self.screen_stack):
-            if action == "show_help":
-                return True
-            return False
+        if self._active_modal_type is HelpScreen:
+            return action == "show_help"
         return True
 
+    def push_screen(self, *args, **kwargs):
+        """Push a screen, tracking the active modal for check_action"""
+        result = super().push_screen(*args, **kwargs)
+        self._update_modal_state()
+        return result
+
+    def pop_screen(self):
+        """Pop a screen, tracking the active modal for check_action"""
+        result = super().pop_screen()
+        self._update_modal_state()
+        return result
+
+    def _update_modal_state(self):
+        """Record the modal depth and topmost modal once per screen change, not once per key"""
+        self._modal_depth = len(self.screen_stack) - 1
+        # Nothing can be pushed over HelpScreen (check_action blocks it), so the top
+        # screen is enough to tell whether help is open
+        self._active_modal_type = type(self.screen) if self._modal_depth else None
+
     def __init__(
         self, session_manager: SessionManager, initial_session_number: Optional[int] = None
     ):
         super().__init__()
         self.session_manager = session_manager
-        self.session_list: Optional[SessionList] = None
-        self.thread_view: Optional[ThreadView] = None
+        # Assigned in on_mount, before any binding can fire, so actions use them
+        # without None checks
+        self.session_list: SessionList = cast(SessionList, None)
+        self.thread_view: ThreadView = cast(ThreadView, None)
         self.user_only_mode: bool = False
         self.search_query: str = ""
         self.filtered_sessions: List[Session] = []
+        # Bumped whenever a content search is abandoned, so its queued results are dropped
+        self._search_generation: int = 0
         self.initial_session_number: Optional[int] = initial_session_number
         self._last_g_press: Optional[float] = None  # Track double g press
+        self._modal_depth: int = 0  # Screens pushed above the main screen
+        self._active_modal_type: Optional[type] = None  # Type of the topmost modal screen
+        self._pending_update_timer: Optional[Timer] = None  # Debounced thread update
+        self._pending_resize_timer: Optional[Timer] = None  # Coalesced pane resize
         # Thread search state
         self._thread_search_term: str = ""
-        self._thread_search_matches: List[int] = []  # Character positions of matches
+        self._thread_search_matches: List[int] = []  # Byte positions of matches
         self._thread_search_index: int = -1  # Current match index
-        self._thread_raw_text: str = ""  # Raw text content for searching
+        self._thread_raw_bytes: bytes = b""  # Lowercased UTF-8 thread text for searching
+        # (session id, tag, user-only mode, mtime_ns) _thread_raw_bytes was built for
+        self._thread_raw_bytes_key: Optional[Tuple[str, Optional[str], bool, int]] = None
+        self._thread_newline_offsets: List[int] = []  # Positions of "\n" in _thread_raw_bytes
         # Pane width (percentage for left pane)
         self._left_pane_width: int = 30
 
@@ -894,9 +1468,79 @@ class ClaudeYelpApp(App):
         # Set initial focus to session list
         self.set_focus(self.session_list)
 
+        if not self.session_manager.discovered:
+            # Scan in the background so the UI paints right away
+            self.sub_title = "Scanning sessions..."
+            self.run_worker(
+                functools.partial(
+                    self.session_manager._discover_sessions_async,
+                    on_batch=lambda batch: self.call_from_thread(self._on_discovery_batch, batch),
+                    on_done=lambda: self.call_from_thread(self._on_discovery_done),
+                ),
+                thread=True,
+                group="discovery",
+            )
+            return
+
+        self._show_initial_session()
+        self._start_search_warmup()
+
+    def _start_search_warmup(self):
+        """Cache the newest sessions' message text so content search starts quickly"""
+        self.run_worker(self._warm_search_cache, thread=True, group="search-warmup")
+
+    def _warm_search_cache(self):
+        """Fill the content search cache for the newest sessions (runs in a worker thread)"""
+        worker = get_current_worker()
+        for session in self.session_manager.sessions[: self.SEARCH_WARMUP_SESSIONS]:
+            # Checked per session so quitting doesn't wait for the rest
+            if worker.is_cancelled:
+                return
+            try:
+                session.content_lower()
+            except Exception as e:
+                _debug_log(f"Failed to read session {session.session_id[:8]}: {e}")
+
+    def _on_discovery_batch(self, batch: List[Session]):
+        """Show sessions from the background scan as they arrive"""
+        # Session numbers and search results only make sense on the full sorted
+        # list, so those wait for the scan to finish
+        if self.search_query or self.initial_session_number is not None:
+            return
+        first_batch = not self.session_list.get_sessions()
+        self.session_list._append_batch(batch)
+        if first_batch:
+            session = self.session_list.get_selected_session()
+            if session:
+                self.thread_view.update_session(session, user_only=self.user_only_mode)
+
+    def _on_discovery_done(self):
+        """Replace the partial list with the sorted sessions once the scan finishes"""
+        self.sub_title = ""
+        self._start_search_warmup()
+        if self.search_query:
+            self._apply_search_filter(self.search_query)
+            return
+        if self.initial_session_number is not None:
+            self.session_list._populate()
+            self._show_initial_session()
+            return
+
+        # Keep the session the user moved to while scanning, otherwise start at the top
+        selected = self.session_list.get_selected_session() if self.session_list.index else None
+        sessions = self.session_manager.sessions
+        index = sessions.index(selected) if selected in sessions else 0
+        self.session_list._populate(sessions, initial_index=index)
+        session = self.session_list.get_selected_session()
+        if session and session is not self.thread_view.current_session:
+            self.thread_view.update_session(session, user_only=self.user_only_mode)
+
+    def _show_initial_session(self):
+        """Jump to the requested session, or show the first one"""
         # If initial_session_number is provided, jump to that session
         if self.initial_session_number is not None:
-            # Use a timer to ensure everything is fully mounted and rendered
+            # Wait for the list to be mounted and laid out; _goto_session re-applies
+            # the selection after its own refresh, so once is enough here
             def jump_to_initial():
                 # Make sure list is visible and has focus
                 self.set_focus(self.session_list)
@@ -904,9 +1548,7 @@ class ClaudeYelpApp(App):
                 # Now jump to the session
                 self._goto_session(self.initial_session_number)
 
-            # Use both call_after_refresh and a timer to ensure it works
             self.call_after_refresh(jump_to_initial)
-            self.set_timer(0.2, jump_to_initial)
         else:
             # Update thread view with first session
             session = self.session_list.get_selected_session()
@@ -920,11 +1562,6 @@ class ClaudeYelpApp(App):
             if session:
                 self.thread_view.update_session(session, user_only=self.user_only_mode)
 
-    def on_list_view_highlighted(self, event: ListView.Highlighted) -> None:
-        """Handle list view highlight changes"""
-        # Ensure the highlighted item is visible
-        pass
-
     def action_focus_left(self):
         """Focus the left panel (session list)"""
         if self.session_list:
@@ -939,30 +1576,59 @@ class ClaudeYelpApp(App):
         """Make left pane narrower"""
         if self._left_pane_width > 15:
             self._left_pane_width -= 5
-            self._apply_pane_widths()
+            self._schedule_pane_widths()
 
     def action_resize_right(self):
         """Make left pane wider"""
         if self._left_pane_width < 70:
             self._left_pane_width += 5
-            self._apply_pane_widths()
+            self._schedule_pane_widths()
+
+    def _schedule_pane_widths(self):
+        """Apply the pane widths at the next frame boundary
+
+        Resizes arriving before then (a held key) are folded into that one update.
+        """
+        if self._pending_resize_timer is None:
+            self._pending_resize_timer = self.set_timer(
+                self.PANE_RESIZE_DELAY, self._apply_pane_widths
+            )
 
     def _apply_pane_widths(self):
         """Apply current pane width settings"""
+        self._pending_resize_timer = None
         if self.session_list and self.thread_view:
-            self.session_list.styles.width = f"{self._left_pane_width}%"
-            self.thread_view.styles.width = f"{100 - self._left_pane_width}%"
+            # Set both widths under one batch so they share a single layout pass
+            with self.batch_update():
+                self.session_list.styles.width = f"{self._left_pane_width}%"
+                self.thread_view.styles.width = f"{100 - self._left_pane_width}%"
+
+    def _schedule_thread_update(self):
+        """Show the selected session in the thread view once navigation settles
+
+        Rapid j/k or paging only loads the session the selection comes to rest on.
+        """
+        if self._pending_update_timer is not None:
+            self._pending_update_timer.stop()
+        self._pending_update_timer = self.set_timer(
+            self.THREAD_UPDATE_DELAY, self._update_thread_from_selection
+        )
+
+    def _update_thread_from_selection(self):
+        """Show the currently selected session in the thread view"""
+        self._pending_update_timer = None
+        session = self.session_list.get_selected_session()
+        if session:
+            self.thread_view.update_session(session, user_only=self.user_only_mode)
 
     def action_move_up(self):
         """Move selection up - works contextually based on focused panel"""
         focused = self.focused
         if focused == self.session_list:
             # Navigate session list - use current displayed sessions
-            if self.session_list and self.session_list.index > 0:
+            if self.session_list.index is not None and self.session_list.index > 0:
                 self.session_list.index -= 1
-                session = self.session_list.get_selected_session()
-                if session and self.thread_view:
-                    self.thread_view.update_session(session, user_only=self.user_only_mode)
+                self._schedule_thread_update()
         elif focused == self.thread_view:
             # Delegate to thread view's scroll action
             self.thread_view.action_scroll_up()
@@ -972,16 +1638,12 @@ class ClaudeYelpApp(App):
         focused = self.focused
         if focused == self.session_list:
             # Navigate session list - use current displayed sessions
-            current_sessions = (
-                self.session_list._sessions_to_display
-                if self.session_list._sessions_to_display
-                else self.session_manager.sessions
-            )
-            if self.session_list and self.session_list.index < len(current_sessions) - 1:
+            if (
+                self.session_list.index is not None
+                and self.session_list.index < self.session_list.max_index
+            ):
                 self.session_list.index += 1
-                session = self.session_list.get_selected_session()
-                if session and self.thread_view:
-                    self.thread_view.update_session(session, user_only=self.user_only_mode)
+                self._schedule_thread_update()
         elif focused == self.thread_view:
             # Delegate to thread view's scroll action
             self.thread_view.action_scroll_down()
@@ -995,13 +1657,11 @@ class ClaudeYelpApp(App):
         elif focused == self.session_list:
             # If session list is focused, scroll it
             # ListView doesn't have page scroll by default, so scroll by multiple items
-            if self.session_list and self.session_list.index > 0:
+            if self.session_list.index is not None and self.session_list.index > 0:
                 # Scroll up by a page worth (approximately 10 items or visible height)
                 new_index = max(0, self.session_list.index - 10)
                 self.session_list.index = new_index
-                session = self.session_list.get_selected_session()
-                if session and self.thread_view:
-                    self.thread_view.update_session(session, user_only=self.user_only_mode)
+                self._schedule_thread_update()
         # Don't change focus - only work in active pane
 
     def action_page_down(self):
@@ -1012,25 +1672,17 @@ class ClaudeYelpApp(App):
             self.thread_view.action_scroll_page_down()
         elif focused == self.session_list:
             # If session list is focused, scroll it
-            current_sessions = (
-                self.session_list._sessions_to_display
-                if self.session_list._sessions_to_display
-                else self.session_manager.sessions
-            )
-            if self.session_list and self.session_list.index < len(current_sessions) - 1:
+            max_index = self.session_list.max_index
+            if self.session_list.index is not None and self.session_list.index < max_index:
                 # Scroll down by a page worth (approximately 10 items or visible height)
-                new_index = min(len(current_sessions) - 1, self.session_list.index + 10)
+                new_index = min(max_index, self.session_list.index + 10)
                 self.session_list.index = new_index
-                session = self.session_list.get_selected_session()
-                if session and self.thread_view:
-                    self.thread_view.update_session(session, user_only=self.user_only_mode)
+                self._schedule_thread_update()
         # Don't change focus - only work in active pane
 
     def action_go_to_top(self):
         """Go to top of active panel (vim: gg)"""
-        import time
-
-        current_time = time.time()
+        current_time = time.perf_counter()
 
         # Check for double g press (within 0.5 seconds)
         if self._last_g_press is not None and (current_time - self._last_g_press) < 0.5:
@@ -1038,16 +1690,11 @@ class ClaudeYelpApp(App):
             focused = self.focused
             if focused == self.session_list:
                 # Go to first session
-                if self.session_list:
-                    self.session_list.index = 0
-                    session = self.session_list.get_selected_session()
-                    if session and self.thread_view:
-                        self.thread_view.update_session(session, user_only=self.user_only_mode)
+                self.session_list.index = 0
+                self._schedule_thread_update()
             elif focused == self.thread_view:
-                # Scroll to top of thread
-                if self.thread_view:
-                    # Scroll to the beginning
-                    self.thread_view.scroll_to(0, 0, animate=False)
+                # Scroll to the beginning of the thread
+                self.thread_view.scroll_to(0, 0, animate=False)
 
             self._last_g_press = None  # Reset
         else:
@@ -1059,93 +1706,27 @@ class ClaudeYelpApp(App):
         focused = self.focused
         if focused == self.session_list:
             # Go to last session
-            current_sessions = (
-                self.session_list._sessions_to_display
-                if self.session_list._sessions_to_display
-                else self.session_manager.sessions
-            )
-            if self.session_list and current_sessions:
-                self.session_list.index = len(current_sessions) - 1
-                session = self.session_list.get_selected_session()
-                if session and self.thread_view:
-                    self.thread_view.update_session(session, user_only=self.user_only_mode)
+            max_index = self.session_list.max_index
+            if max_index >= 0:
+                self.session_list.index = max_index
+                self._schedule_thread_update()
         elif focused == self.thread_view:
-            # Scroll to absolute bottom of thread
-            if self.thread_view:
-                try:
-                    # Get the content widget to find its dimensions
-                    content_widget = self.thread_view.query_one("#thread-content", ThreadContent)
-                    if content_widget:
-                        # Get the content region to find its height
-                        content_region = content_widget.region
-                        if content_region:
-                            # Get the viewport height
-                            viewport_height = self.thread_view.size.height
-                            # Calculate maximum scroll position
-                            # Max scroll = content height - viewport height
-                            max_scroll_y = max(0, content_region.height - viewport_height)
-
-                            # Scroll directly to the bottom
-                            try:
-                                # Try to scroll to the calculated position
-                                self.thread_view.scroll_to(0, max_scroll_y, animate=False)
-                            except Exception:
-                                # Fallback: scroll to a very large y value
-                                self.thread_view.scroll_to(0, 999999, animate=False)
-                        else:
-                            # Content not rendered yet, use fallback
-                            self._scroll_to_bottom_fallback()
-                    else:
-                        # Content widget not found, use fallback
-                        self._scroll_to_bottom_fallback()
-                except Exception:
-                    # Use fallback method
-                    self._scroll_to_bottom_fallback()
-
-    def _scroll_to_bottom_fallback(self):
-        """Fallback method to scroll to bottom by repeatedly scrolling"""
-        if not self.thread_view:
-            return
-        try:
-            # Keep scrolling down until we can't scroll anymore
-            last_y = None
-            no_change_count = 0
-            for _ in range(2000):  # Max iterations
-                try:
-                    # Get current scroll position
-                    try:
-                        _ = self.thread_view.scroll_offset.y
-                    except Exception as e:
-                        _debug_log(f"Failed to get scroll offset: {e}")
-
-                    # Scroll one line down (smallest increment)
-                    self.thread_view.scroll_down(animate=False)
-
-                    # Get new scroll position
-                    try:
-                        new_y = self.thread_view.scroll_offset.y
-                    except Exception:
-                        new_y = getattr(self.thread_view, "scroll_y", 0)
-
-                    # If scroll position didn't change, count consecutive no-changes
-                    if last_y is not None and new_y == last_y:
-                        no_change_count += 1
-                        # If we haven't changed for 10 iterations, we're at the bottom
-                        if no_change_count >= 10:
-                            break
-                    else:
-                        no_change_count = 0
-
-                    last_y = new_y
-                except Exception as e:
-                    _debug_log(f"Scroll iteration error: {e}")
-                    break
-        except Exception as e:
-            _debug_log(f"Scroll to bottom fallback error: {e}")
+            # Scroll to absolute bottom of thread. Mount any lazily rendered chunks
+            # first; scroll_end waits for the next refresh, so it sees their height
+            # and Textual clamps to max_scroll_y
+            self.thread_view.render_all()
+            self.thread_view.scroll_end(animate=False)
+
+    def _still_scanning(self) -> bool:
+        """Tell the user to wait if the background session scan hasn't finished"""
+        if self.session_manager.discovered:
+            return False
+        self.notify("Still scanning sessions...", title="Busy", severity="warning", timeout=2)
+        return True
 
     def action_tag_session(self):
         """Tag the current session"""
-        if not self.session_list:
+        if not self.session_list or self._still_scanning():
             return
 
         session = self.session_list.get_selected_session()
@@ -1175,6 +1756,7 @@ class ClaudeYelpApp(App):
         def handle_tag(tag_value: str):
             if tag_value and tag_value.strip():
                 self.session_manager.tag_session(session.session_id, tag_value.strip())
+                self._cancel_search()
                 # Refresh list but keep selection on same session
                 self.session_list._populate(initial_index=current_index)
                 if self.thread_view:
@@ -1192,18 +1774,17 @@ class ClaudeYelpApp(App):
         if not session:
             return
 
-        # Get project directory - use the session's project path
-        project_dir = session.project_path
+        # Get project directory - use the session's project path, normalized but
+        # with symlinks kept (claude files sessions under the cwd as given)
+        project_dir = os.path.abspath(os.path.expanduser(session.project_path))
 
-        # Ensure it's a directory (not a file)
-        if os.path.isfile(project_dir):
-            project_dir = os.path.dirname(project_dir)
-
-        # Normalize the path and ensure it exists
-        project_dir = os.path.abspath(os.path.expanduser(project_dir))
-
-        # Verify the directory exists, fallback to parent if needed
-        if not os.path.isdir(project_dir):
+        # One stat tells apart the common case (an existing directory) from files
+        # and missing paths, which fall back to the parent and then to home
+        try:
+            is_dir = stat.S_ISDIR(os.stat(project_dir).st_mode)
+        except OSError:
+            is_dir = False
+        if not is_dir:
             project_dir = os.path.dirname(project_dir)
             if not os.path.isdir(project_dir):
                 project_dir = os.path.expanduser("~")
@@ -1220,50 +1801,11 @@ class ClaudeYelpApp(App):
         if not session:
             return
 
-        # Build markdown content (similar to export)
-        messages = session.load_messages()
-
-        content = []
-        content.append(f"# Session: {session.session_id}\n\n")
-        content.append(f"**Project:** `{session.project_path}`\n\n")
-        content.append(f"**Date:** {session.date_str}\n\n")
-        if session.tag:
-            content.append(f"**Tag:** {session.tag}\n\n")
-        content.append("---\n\n")
-
-        if not messages:
-            content.append("*No messages found in this session.*\n")
-        else:
-            i = 0
-            while i < len(messages):
-                current_role = messages[i].get("role", "unknown")
-                combined_texts = [messages[i].get("content", "")]
-
-                j = i + 1
-                while j < len(messages) and messages[j].get("role") == current_role:
-                    combined_texts.append(messages[j].get("content", ""))
-                    j += 1
-
-                combined_text = "\n\n".join(combined_texts)
-
-                if current_role == "user":
-                    content.append(f"## User\n\n{combined_text}\n\n")
-                elif current_role == "assistant":
-                    content.append(f"## Assistant\n\n{combined_text}\n\n")
-                elif current_role == "error":
-                    content.append(f"## Error\n\n{combined_text}\n\n")
-                else:
-                    content.append(f"## {current_role.title()}\n\n{combined_text}\n\n")
-
-                i = j
-
-        markdown_content = "".join(content)
+        markdown_content = self.session_manager.build_session_markdown(session)
 
         # Copy to clipboard
         try:
-            import pyperclip
-
-            pyperclip.copy(markdown_content)
+            _pyperclip_copy(markdown_content)
             self.notify(
                 "Thread copied to clipboard!", title="Copied", severity="information", timeout=2
             )
@@ -1296,9 +1838,7 @@ class ClaudeYelpApp(App):
             except Exception as e:
                 _debug_log(f"copy_to_clipboard failed: {e}")
                 try:
-                    import pyperclip
-
-                    pyperclip.copy(selected_text)
+                    _pyperclip_copy(selected_text)
                     self.notify(
                         f"Yanked {len(selected_text)} chars",
                         title="Yanked",
@@ -1312,20 +1852,21 @@ class ClaudeYelpApp(App):
             # Try to get text from X11 PRIMARY selection (what Shift+select copies to)
             _debug_log("Trying X11 PRIMARY selection")
             try:
-                result = subprocess.run(
-                    ["xclip", "-selection", "primary", "-o"],
-                    capture_output=True,
-                    text=True,
-                    timeout=2,
-                )
-                stdout_len = len(result.stdout) if result.stdout else 0
-                _debug_log(f"xclip returncode: {result.returncode}, stdout len: {stdout_len}")
-                if result.returncode == 0 and result.stdout:
-                    selected_text = result.stdout
+                # Read it in-process when python-xlib is available, else ask xclip
+                selected_text = _read_x11_primary()
+                if selected_text is None:
+                    result = subprocess.run(
+                        ["xclip", "-selection", "primary", "-o"],
+                        capture_output=True,
+                        text=True,
+                        timeout=2,
+                    )
+                    stdout_len = len(result.stdout) if result.stdout else 0
+                    _debug_log(f"xclip returncode: {result.returncode}, stdout len: {stdout_len}")
+                    selected_text = result.stdout if result.returncode == 0 else ""
+                if selected_text:
                     # Copy from PRIMARY to CLIPBOARD
-                    import pyperclip
-
-                    pyperclip.copy(selected_text)
+                    _pyperclip_copy(selected_text)
                     self.notify(
                         f"Yanked {len(selected_text)} chars from selection",
                         title="Yanked",
@@ -1363,37 +1904,17 @@ class ClaudeYelpApp(App):
         filepath = os.path.join(cwd, filename)
 
         try:
-            # Load messages
-            messages = session.load_messages()
-
-            # Build markdown content
-            content = []
-            content.append(f"# Claude Session: {session.session_id}\n\n")
-            content.append(f"**Project:** `{session.project_path}`\n\n")
-            content.append(f"**Date:** {session.date_str}\n\n")
-            if session.tag:
-                content.append(f"**Tag:** {session.tag}\n\n")
-            content.append("---\n\n")
-
-            # Add messages
-            for msg in messages:
-                role = msg.get("role", "unknown")
-                text = msg.get("content", "")
-
-                if role == "user":
-                    content.append(f"## 👤 User\n\n{text}\n\n")
-                elif role == "assistant":
-                    # For export, keep plain text (no Rich markup)
-                    content.append(f"## 🤖 Assistant\n\n{text}\n\n")
-                elif role == "error":
-                    content.append(f"## ❌ Error\n\n{text}\n\n")
+            markdown_content = self.session_manager.build_session_markdown(session, export=True)
 
-            if not messages:
-                content.append("*No messages found in this session.*\n")
-
-            # Write to file
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write("".join(content))
+            # Write to file: encode once and hand the bytes straight to os.write
+            data = memoryview(markdown_content.encode("utf-8"))
+            fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+            try:
+                while data:
+                    # os.write may write less than asked for
+                    data = data[os.write(fd, data) :]
+            finally:
+                os.close(fd)
 
             self.notify(
                 f"Exported to: {filepath}",
@@ -1409,7 +1930,7 @@ class ClaudeYelpApp(App):
 
     def action_delete_session(self):
         """Delete the current session"""
-        if not self.session_list:
+        if not self.session_list or self._still_scanning():
             return
 
         session = self.session_list.get_selected_session()
@@ -1454,6 +1975,7 @@ class ClaudeYelpApp(App):
         def handle_delete(confirmed: bool):
             if confirmed:
                 if self.session_manager.delete_session(session.session_id):
+                    self._cancel_search()
                     # Calculate the new index (same position, or last if we deleted the last one)
                     new_index = 0
                     if self.session_manager.sessions:
@@ -1470,8 +1992,7 @@ class ClaudeYelpApp(App):
                     else:
                         # No sessions left, clear thread view
                         if self.thread_view:
-                            from rich.markdown import Markdown
-
+                            self.thread_view._clear_chunks()
                             empty_content = Markdown("# No Sessions\n\nNo sessions available.")
                             content_widget = self.thread_view.query_one(
                                 "#thread-content", ThreadContent
@@ -1509,62 +2030,112 @@ class ClaudeYelpApp(App):
             f"Filter: {mode_text}", title="Filter Toggled", severity="information", timeout=2
         )
 
-    def _search_sessions(self, query: str) -> List[Session]:
-        """Search sessions by query string"""
-        if not query or not query.strip():
-            return self.session_manager.sessions
+    def _search_sessions(self, query: str) -> Tuple[List[Session], List[Session]]:
+        """Search session metadata by query string
 
+        Returns the matching sessions and the remaining ones, whose message
+        content still has to be searched.
+        """
         query_lower = query.lower().strip()
         matching_sessions = []
+        remaining_sessions = []
 
         for session in self.session_manager.sessions:
-            # Search in session ID
-            if query_lower in session.session_id.lower():
-                matching_sessions.append(session)
-                continue
-
-            # Search in tag
-            if session.tag and query_lower in session.tag.lower():
+            # Search in session ID, tag, project path and project name
+            if query_lower in session._search_blob_lower:
                 matching_sessions.append(session)
-                continue
-
-            # Search in project path
-            if query_lower in session.project_path.lower():
-                matching_sessions.append(session)
-                continue
+            else:
+                remaining_sessions.append(session)
 
-            # Search in project name
-            if query_lower in session.project_name.lower():
-                matching_sessions.append(session)
-                continue
+        return matching_sessions, remaining_sessions
 
-            # Search in messages content
+    def _search_session_contents(
+        self, query: str, sessions: List[Session], announce: bool, generation: int
+    ):
+        """Search message content in a worker thread, streaming matches to the list"""
+        worker = get_current_worker()
+        query_lower = query.lower().strip()
+        batch = []
+        for i, session in enumerate(sessions, start=1):
+            if worker.is_cancelled:
+                return
             try:
-                messages = session.load_messages()
-                for msg in messages:
-                    content = msg.get("content", "")
-                    if query_lower in content.lower():
-                        matching_sessions.append(session)
-                        break
+                if session.content_contains(query_lower):
+                    batch.append(session)
             except Exception as e:
                 _debug_log(f"Failed to search session {session.session_id[:8]}: {e}")
+            if batch and i % self.SEARCH_BATCH_SIZE == 0:
+                self.call_from_thread(self._on_search_batch, generation, batch)
+                batch = []
+        if batch:
+            self.call_from_thread(self._on_search_batch, generation, batch)
+        self.call_from_thread(self._on_search_done, generation, query, announce)
+
+    def _cancel_search(self):
+        """Stop a running content search; results it already queued are dropped"""
+        self._search_generation += 1
+        self.workers.cancel_group(self, "search")
+
+    def _on_search_batch(self, generation: int, batch: List[Session]):
+        """Show content matches from the background search as they arrive"""
+        if generation != self._search_generation:
+            return
+        if self.filtered_sessions:
+            shown = self.session_list.get_sessions() is self.filtered_sessions
+            self.filtered_sessions.extend(batch)
+            if shown:
+                self.session_list._show_appended()
+            return
+        # Replace the unfiltered list shown while nothing had matched yet
+        self.filtered_sessions = list(batch)
+        self.session_list._populate(self.filtered_sessions)
+        self.thread_view.update_session(batch[0], user_only=self.user_only_mode)
+
+    def _on_search_done(self, generation: int, query: str, announce: bool):
+        """Put the search results in session order once the content search finishes"""
+        if generation != self._search_generation:
+            return
+        matched = set(self.filtered_sessions)
+        ordered = [s for s in self.session_manager.sessions if s in matched]
+        if ordered != self.filtered_sessions:
+            # Keep the session the user moved to while searching
+            selected = self.session_list.get_selected_session()
+            self.filtered_sessions = ordered
+            index = ordered.index(selected) if selected in matched else 0
+            self.session_list._populate(ordered, initial_index=index)
+        if announce:
+            result_count = len(self.filtered_sessions or self.session_manager.sessions)
+            self.notify(
+                f"Search: {query} ({result_count} results)",
+                title="Search",
+                severity="information",
+                timeout=2,
+            )
 
-        return matching_sessions
+    def _apply_search_filter(self, query: str, announce: bool = False):
+        """Apply search filter to sessions
 
-    def _apply_search_filter(self, query: str):
-        """Apply search filter to sessions"""
+        Metadata matches are shown right away; message content is searched in a
+        worker that adds its matches as it goes. With announce, the result count
+        is reported once that search finishes.
+        """
         self.search_query = query
+        # A running content search is for an older query
+        self._cancel_search()
+        remaining_sessions: List[Session] = []
         if query and query.strip():
-            self.filtered_sessions = self._search_sessions(query)
+            self.filtered_sessions, remaining_sessions = self._search_sessions(query)
         else:
             self.filtered_sessions = []
 
-        # Update session list with filtered results
-        if self.session_list:
-            if self.filtered_sessions:
-                self.session_list._populate(self.filtered_sessions)
-            else:
-                self.session_list._populate(self.session_manager.sessions)
+        # Update session list with filtered results, unless it already shows them
+        sessions = self.filtered_sessions or self.session_manager.sessions
+        if self.session_list and self.session_list.get_sessions() == sessions:
+            if self.filtered_sessions and remaining_sessions:
+                # Share the displayed list, which content search batches extend
+                self.filtered_sessions = self.session_list.get_sessions()
+        elif self.session_list:
+            self.session_list._populate(sessions)
 
             # Select first session if available
             if self.session_list.index >= len(self.session_list._sessions_to_display):
@@ -1575,6 +2146,21 @@ class ClaudeYelpApp(App):
             if session and self.thread_view:
                 self.thread_view.update_session(session, user_only=self.user_only_mode)
 
+        if remaining_sessions:
+            self.run_worker(
+                functools.partial(
+                    self._search_session_contents,
+                    query,
+                    remaining_sessions,
+                    announce,
+                    self._search_generation,
+                ),
+                thread=True,
+                group="search",
+            )
+        elif query and query.strip():
+            self._on_search_done(self._search_generation, query, announce)
+
     def _get_thread_raw_text(self) -> str:
         """Get raw text content of current thread for searching"""
         if not self.session_list:
@@ -1584,8 +2170,6 @@ class ClaudeYelpApp(App):
         if not session:
             return ""
 
-        messages = session.load_messages()
-
         # Build plain text content
         content_parts = []
         content_parts.append(f"Session: {session.session_id}\n")
@@ -1595,42 +2179,68 @@ class ClaudeYelpApp(App):
             content_parts.append(f"Tag: {session.tag}\n")
         content_parts.append("\n")
 
-        if messages:
-            i = 0
-            while i < len(messages):
-                current_role = messages[i].get("role", "unknown")
-                combined_texts = [messages[i].get("content", "")]
-
-                j = i + 1
-                while j < len(messages) and messages[j].get("role") == current_role:
-                    combined_texts.append(messages[j].get("content", ""))
-                    j += 1
-
-                combined_text = "\n\n".join(combined_texts)
-                content_parts.append(f"{current_role.title()}:\n{combined_text}\n\n")
-                i = j
+        for role, combined_text in session.iter_grouped_messages(user_only=self.user_only_mode):
+            # Separate parts, so the (possibly long) message text is only copied by the join
+            content_parts.extend((role.title(), ":\n", combined_text, "\n\n"))
 
         return "".join(content_parts)
 
+    def _update_thread_raw_bytes(self):
+        """Rebuild the lowercased thread bytes, unless the cached ones are still current"""
+        session = self.session_list.get_selected_session() if self.session_list else None
+        key = None
+        if session:
+            mtime = session._file_mtime()
+            if mtime is not None:
+                key = (session.session_id, session.tag, self.user_only_mode, mtime)
+        if key is not None and key == self._thread_raw_bytes_key:
+            return
+        # Lowercased once here, so each search is a plain bytes.find
+        self._thread_raw_bytes = self._get_thread_raw_text().lower().encode("utf-8")
+        self._thread_raw_bytes_key = key
+
+        # Newline positions, so a match's line number is a bisect away
+        data = self._thread_raw_bytes
+        offsets = []
+        pos = data.find(b"\n")
+        while pos != -1:
+            offsets.append(pos)
+            pos = data.find(b"\n", pos + 1)
+        self._thread_newline_offsets = offsets
+
     def _search_in_thread(self, query: str):
-        """Search for text within the thread content"""
-        _debug_log(f"_search_in_thread: query='{query}'")
+        """Search for text within the thread content
+
+        Matches are found case-insensitively and don't overlap, the same as the
+        highlighting in the thread view. Match positions are byte offsets into
+        _thread_raw_bytes.
+        """
+        if DEBUG_ENABLED:
+            _debug_log(f"_search_in_thread: query='{query}'")
 
         self._thread_search_term = query
-        self._thread_raw_text = self._get_thread_raw_text().lower()
+        session = self.session_list.get_selected_session() if self.session_list else None
+        if session:
+            # Parse once; the search text and the highlighted render below (and later
+            # queries on this thread) all reuse the loaded messages
+            session.load_messages()
+        self._update_thread_raw_bytes()
 
         # Find all match positions
         self._thread_search_matches = []
-        query_lower = query.lower()
+        query_bytes = query.lower().encode("utf-8")
         start = 0
-        while True:
-            pos = self._thread_raw_text.find(query_lower, start)
+        # An empty query would match at every position
+        while query_bytes:
+            pos = self._thread_raw_bytes.find(query_bytes, start)
             if pos == -1:
                 break
             self._thread_search_matches.append(pos)
-            start = pos + 1
+            # Resume after the match, not inside it
+            start = pos + len(query_bytes)
 
-        _debug_log(f"Found {len(self._thread_search_matches)} matches")
+        if DEBUG_ENABLED:
+            _debug_log(f"Found {len(self._thread_search_matches)} matches")
 
         # Refresh thread view with highlighting
         if self.thread_view and self.session_list:
@@ -1661,14 +2271,15 @@ class ClaudeYelpApp(App):
         if match_index >= len(self._thread_search_matches):
             match_index = 0
 
-        _debug_log(f"_jump_to_thread_match: index={match_index}")
+        if DEBUG_ENABLED:
+            _debug_log(f"_jump_to_thread_match: index={match_index}")
 
-        # Calculate approximate line number based on character position
-        char_pos = self._thread_search_matches[match_index]
-        text_before = self._thread_raw_text[:char_pos]
-        line_number = text_before.count("\n")
+        # Calculate approximate line number based on the match position
+        byte_pos = self._thread_search_matches[match_index]
+        line_number = bisect.bisect_left(self._thread_newline_offsets, byte_pos)
 
-        _debug_log(f"Match at char {char_pos}, approx line {line_number}")
+        if DEBUG_ENABLED:
+            _debug_log(f"Match at byte {byte_pos}, approx line {line_number}")
 
         # Scroll thread view to that position
         if self.thread_view:
@@ -1676,14 +2287,15 @@ class ClaudeYelpApp(App):
             # Each line is roughly 1 unit of scroll
             scroll_y = max(0, line_number - 5)  # Show a few lines above
             self.thread_view.scroll_to(0, scroll_y, animate=False)
-            _debug_log(f"Scrolled to y={scroll_y}")
+            if DEBUG_ENABLED:
+                _debug_log(f"Scrolled to y={scroll_y}")
 
     def _clear_thread_search(self):
         """Clear thread search state"""
         self._thread_search_term = ""
         self._thread_search_matches = []
         self._thread_search_index = -1
-        self._thread_raw_text = ""
+        # _thread_raw_bytes is kept for the next search; its key says if it's stale
 
         # Refresh thread view without highlighting
         if self.thread_view and self.session_list:
@@ -1733,6 +2345,8 @@ class ClaudeYelpApp(App):
 
     def _goto_session(self, number: int):
         """Go to session by line number"""
+        if self._still_scanning():
+            return
         # Use filtered sessions if search is active, otherwise all sessions
         sessions = (
             self.filtered_sessions if self.filtered_sessions else self.session_manager.sessions
@@ -1747,6 +2361,7 @@ class ClaudeYelpApp(App):
 
             # Make sure the session list shows the right sessions
             # Pass initial_index to set it during population
+            self._cancel_search()
             if self.filtered_sessions:
                 self.session_list._populate(
                     self.filtered_sessions, preserve_index=False, initial_index=target_index
@@ -1763,44 +2378,8 @@ class ClaudeYelpApp(App):
             # Focus the session list immediately so highlight will be visible
             self.set_focus(self.session_list)
 
-            # Use multiple callbacks to ensure selection is properly applied
-            # after list is fully rendered
-            def ensure_selection():
-                if target_index < len(self.session_list._sessions_to_display):
-                    # Ensure list has focus (critical for highlight to show)
-                    self.set_focus(self.session_list)
-
-                    # Re-set index to trigger highlight
-                    # (this will call watch_index which sets highlighted=True)
-                    self.session_list.index = target_index
-
-                    # Manually ensure the highlight is set (in case watch_index didn't fire)
-                    try:
-                        if hasattr(self.session_list, "_nodes") and target_index < len(
-                            self.session_list._nodes
-                        ):
-                            highlighted_item = self.session_list._nodes[target_index]
-                            if isinstance(highlighted_item, ListItem):
-                                highlighted_item.highlighted = True
-                    except (IndexError, AttributeError, TypeError):
-                        pass
-
-                    # Try to scroll the selected item into view
-                    try:
-                        highlighted_child = self.session_list.highlighted_child
-                        if highlighted_child:
-                            self.session_list.scroll_to_widget(highlighted_child, animate=False)
-                    except (IndexError, AttributeError, TypeError):
-                        pass
-
-                    # Force refresh to show selection/highlight
-                    self.session_list.refresh(layout=True)
-
-            # Use call_after_refresh to ensure list is fully rendered
-            self.call_after_refresh(ensure_selection)
-
-            # Also use a timer as backup (small delay to ensure rendering is complete)
-            self.set_timer(0.2, ensure_selection)
+            # _populate re-applies the index, highlight and scroll position itself
+            # once the old rows are gone, so nothing needs re-checking after a refresh
 
             self.notify(
                 f"Jumped to session {number}", title="Goto", severity="information", timeout=2
@@ -1849,19 +2428,8 @@ class ClaudeYelpApp(App):
                 # Search within thread content
                 self._search_in_thread(value)
             elif value:
-                # Filter sessions list
-                self._apply_search_filter(value)
-                result_count = (
-                    len(self.filtered_sessions)
-                    if self.filtered_sessions
-                    else len(self.session_manager.sessions)
-                )
-                self.notify(
-                    f"Search: {value} ({result_count} results)",
-                    title="Search",
-                    severity="information",
-                    timeout=2,
-                )
+                # Filter sessions list, reporting the count once all content is searched
+                self._apply_search_filter(value, announce=True)
             else:
                 # Empty search clears filter
                 self._apply_search_filter("")
@@ -1909,7 +2477,7 @@ class ClaudeYelpApp(App):
 
     def action_show_help(self):
         """Toggle keyboard shortcuts help screen"""
-        if any(isinstance(s, HelpScreen) for s in self.screen_stack):
+        if self._active_modal_type is HelpScreen:
             self.pop_screen()
             return
         self.push_screen(HelpScreen())
@@ -1917,7 +2485,7 @@ class ClaudeYelpApp(App):
     def action_escape(self):
         """Handle ESC key - dismiss modal if one is active"""
         # Check if we have a modal screen on top
-        if len(self.screen_stack) > 1:
+        if self._modal_depth:
             self.pop_screen()
 
     def action_new_session(self):
@@ -1948,6 +2516,42 @@ class ClaudeYelpApp(App):
         self.push_screen(NewSessionInputScreen(), handle_new_session)
 
 
+def _update_tags_file(tags_file: Path, update: Callable[[Dict[str, str]], None]):
+    """Read, modify and rewrite the tags file in one go, holding an exclusive lock
+
+    The lock (where fcntl is available) keeps two clod processes creating
+    sessions at the same time from dropping each other's tags.
+    """
+    fd = os.open(tags_file, os.O_RDWR | os.O_CREAT, 0o644)
+    with os.fdopen(fd, "rb+") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        tags = {}
+        content = f.read()
+        if content.strip():
+            try:
+                tags = json_loads(content)
+            except Exception as e:
+                _debug_log(f"Failed to load tags file: {e}")
+        update(tags)
+        f.seek(0)
+        f.truncate()
+        f.write(json.dumps(tags, indent=2).encode())
+
+
+def _find_session_file(session_id: str) -> Optional[Path]:
+    """Locate a session's .jsonl file, trying the current directory's project first"""
+    projects_dir = Path.home() / ".claude" / "projects"
+    # Claude names a project's directory after its path with the separators (and
+    # other non-alphanumeric characters) turned into dashes
+    encoded_cwd = re.sub(r"[^A-Za-z0-9]", "-", os.getcwd())
+    session_file = projects_dir / encoded_cwd / f"{session_id}.jsonl"
+    if session_file.exists():
+        return session_file
+    # Session files sit directly in the project directories, so one level is enough
+    return next(projects_dir.glob(f"*/{session_id}.jsonl"), None)
+
+
 def create_tagged_session(tag: str, temp: bool = False):
     """Create a new Claude session with a tag and launch it."""
     # Check if tag already exists
@@ -1955,7 +2559,7 @@ def create_tagged_session(tag: str, temp: bool = False):
     old_session_id = None
     if tags_file.exists():
         try:
-            tags = json.loads(tags_file.read_text())
+            tags = json_loads(tags_file.read_bytes())
             for session_id, existing_tag in tags.items():
                 if existing_tag == tag:
                     print(f"Tag '{tag}' already exists (session {session_id[:8]})")
@@ -1987,8 +2591,7 @@ def create_tagged_session(tag: str, temp: bool = False):
         sys.exit(1)
 
     # Parse JSON - clean control characters
-    output = result.stdout.strip()
-    output = "".join(c for c in output if ord(c) >= 32 or c in "\n\r\t")
+    output = result.stdout.strip().translate(_CONTROL_CHARS_TABLE)
 
     try:
         data = json.loads(output)
@@ -2005,25 +2608,21 @@ def create_tagged_session(tag: str, temp: bool = False):
     if temp:
         print(f"Created TEMP session {session_id[:8]} with tag: {tag}")
     else:
-        # Save tag
-        tags_file = Path.home() / ".claude" / "claude-yelp-tags.json"
-        tags = {}
-        if tags_file.exists():
-            try:
-                tags = json.loads(tags_file.read_text())
-            except Exception as e:
-                _debug_log(f"Failed to load tags file: {e}")
+        # Save tag, dropping the old session's if overwriting
+        def save_tag(tags: Dict[str, str]):
+            if old_session_id:
+                tags.pop(old_session_id, None)
+            tags[session_id] = tag
+
+        _update_tags_file(tags_file, save_tag)
+
         # Remove old session if overwriting
         if old_session_id:
-            tags.pop(old_session_id, None)
             # Delete old session file
-            projects_dir = Path.home() / ".claude" / "projects"
-            for old_file in projects_dir.rglob(f"{old_session_id}.jsonl"):
+            old_file = _find_session_file(old_session_id)
+            if old_file:
                 old_file.unlink()
                 print(f"Removed old session {old_session_id[:8]}")
-                break
-        tags[session_id] = tag
-        tags_file.write_text(json.dumps(tags, indent=2))
         print(f"Created session {session_id[:8]} with tag: {tag}")
 
     # Launch claude with session_id in environment
@@ -2034,8 +2633,8 @@ def create_tagged_session(tag: str, temp: bool = False):
         # Run claude (not exec) so we can cleanup after
         subprocess.run(["claude", "--resume", session_id], env=env)
         # Cleanup: find and delete session file
-        projects_dir = Path.home() / ".claude" / "projects"
-        for session_file in projects_dir.rglob(f"{session_id}.jsonl"):
+        session_file = _find_session_file(session_id)
+        if session_file:
             session_file.unlink()
             # Also remove session directory if exists
             session_dir = session_file.parent / session_id
@@ -2045,7 +2644,6 @@ def create_tagged_session(tag: str, temp: bool = False):
                 except OSError:
                     pass
             print(f"Cleaned up temp session {session_id[:8]}")
-            break
         sys.exit(0)
     else:
         os.execvpe("claude", ["claude", "--resume", session_id], env)
@@ -2054,49 +2652,61 @@ def create_tagged_session(tag: str, temp: bool = False):
 def main():
     """Main entry point"""
     global DEBUG_ENABLED
-    import argparse
-    from datetime import datetime
 
-    parser = argparse.ArgumentParser(
-        description="Claude Yelp - Session manager for Claude CLI",
-        epilog="Examples: clod, clod +10, clod 'my-tag', clod -t 'temp-tag'",
-    )
-    parser.add_argument(
-        "--debug", action="store_true", help="Enable debug logging to /tmp/claude-yelp-debug.log"
-    )
-    parser.add_argument(
-        "-t", "--temp", action="store_true", help="Temporary session (deleted on exit)"
-    )
-    parser.add_argument(
-        "arg", nargs="?", type=str, help="Session number (+10 or 10) or tag name for new session"
-    )
+    argv = sys.argv[1:]
+    if not argv or (len(argv) == 1 and argv[0].lstrip("+").isdigit()):
+        # Plain "clod" or "clod +10" - the common case needs no argparse
+        arg: Optional[str] = argv[0] if argv else None
+        debug = temp = False
+    else:
+        import argparse
+
+        parser = argparse.ArgumentParser(
+            description="Claude Yelp - Session manager for Claude CLI",
+            epilog="Examples: clod, clod +10, clod 'my-tag', clod -t 'temp-tag'",
+        )
+        parser.add_argument(
+            "--debug",
+            action="store_true",
+            help="Enable debug logging to /tmp/claude-yelp-debug.log",
+        )
+        parser.add_argument(
+            "-t", "--temp", action="store_true", help="Temporary session (deleted on exit)"
+        )
+        parser.add_argument(
+            "arg",
+            nargs="?",
+            type=str,
+            help="Session number (+10 or 10) or tag name for new session",
+        )
 
-    args = parser.parse_args()
+        args = parser.parse_args(argv)
+        arg, debug, temp = args.arg, args.debug, args.temp
 
     # Enable debug logging if --debug flag is passed or env var is set
-    if args.debug or os.environ.get("CLAUDE_YELP_DEBUG", "").lower() in ("1", "true", "yes"):
+    if debug or os.environ.get("CLAUDE_YELP_DEBUG", "").lower() in ("1", "true", "yes"):
         DEBUG_ENABLED = True
         with open(DEBUG_LOG_FILE, "w") as f:
-            source = "--debug flag" if args.debug else "CLAUDE_YELP_DEBUG env"
+            source = "--debug flag" if debug else "CLAUDE_YELP_DEBUG env"
             f.write(f"=== claude-yelp started at {datetime.now().isoformat()} ({source}) ===\n")
         _debug_log("Debug logging enabled")
 
     initial_session_number = None
-    if args.arg:
+    if arg:
         # Handle both "+10" and "10" formats for session number
-        session_str = args.arg.lstrip("+")
+        session_str = arg.lstrip("+")
         if session_str.isdigit():
             initial_session_number = int(session_str)
         else:
             # Not a number - treat as tag for new session
-            create_tagged_session(args.arg, temp=args.temp)
-    elif args.temp:
+            create_tagged_session(arg, temp=temp)
+    elif temp:
         print("Error: -t requires a tag name", file=sys.stderr)
         sys.exit(1)
 
     _debug_log("About to create SessionManager")
     try:
-        session_manager = SessionManager()
+        session_manager = SessionManager(discover=False)
     except Exception as e:
         _debug_log(f"Error creating SessionManager: {e}")
         raise